@@ -6,7 +6,7 @@ from versatile.domain import MaterialisedComponent
 
 
 def set_metadata(func: Callable, **kwargs) -> Callable:
-    metadata = func.__provider_metadata__ if hasattr(func, '__provider_metadata__') else {}
+    metadata = getattr(func, '__provider_metadata__', {})
     metadata.update(kwargs)
     func.__provider_metadata__ = metadata
     return func
@@ -35,13 +35,8 @@ def repository_builder(db):
         if not component.metadata.get("is_repository"):
             return component
 
-        return MaterialisedComponent(
-            component.id,
-            component.name,
-            component.declared_types,
-            make_repository(component.component, db),
-            component.dependencies,
-            component.metadata,
+        return component._replace(
+            component=make_repository(component.component, db)
         )
 
     return build
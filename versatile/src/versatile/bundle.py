@@ -16,7 +16,6 @@ from typing import Any, Union
 from versatile.bundle_manifest import BundleManifest
 from versatile.component_builder import ComponentBuilder
 from versatile.component_set import ComponentSet
-from versatile.domain import MaterialisedComponent
 
 from versatile.errors import DependencyError
 
@@ -98,7 +97,7 @@ class BundleBuilder:
 
             looked_up_components = {
                 dependency_name: get_component(dependency_name)
-                for dependency_name in resolved_provider.resolved_dependencies.values()
+                for dependency_name in resolved_provider.dependency_names
             }
 
             built[component_name] = self._component_builder.build(
@@ -11,8 +11,16 @@ while respecting dependency relationships.
 """
 
 from collections import deque, defaultdict
-from dataclasses import dataclass
-from typing import Optional, FrozenSet, Iterable
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    FrozenSet,
+    Iterable,
+    Callable,
+    Any,
+    Mapping,
+)
 
 from versatile.component_set import ComponentSet
 from versatile.errors import DependencyError
@@ -25,9 +33,63 @@ __all__ = ["ResolvedComponentProvider", "BundleManifest", "BundleManifestBuilder
 
 @dataclass(frozen=True)
 class ResolvedComponentProvider:
+    """A provider whose dependencies have been resolved to component names.
+
+    Besides its fields, each instance carries two attributes derived once when
+    it is created, so that building a bundle does not repeat the work for every
+    component:
+
+    - ``dependency_names``: distinct names of the components this provider
+      depends on, in parameter order.
+    - ``invoke``: calls the provider function with its dependencies looked up
+      by component name from a mapping, or reuses the provider's component if
+      it is memoized.
+    """
+
+    # Declared by hand, since dataclass(slots=True) needs Python 3.10.
+    __slots__ = ("provider", "resolved_dependencies", "dependency_names", "invoke")
+
     provider: ComponentProvider
     resolved_dependencies: dict[str, str]
 
+    if TYPE_CHECKING:
+        # Derived in __post_init__. Declared as fields for type checkers only: at
+        # runtime, the field() default would clash with the slot.
+        dependency_names: tuple[str, ...] = field(init=False, repr=False, compare=False)
+        invoke: Callable[[Mapping[str, Any]], Any] = field(
+            init=False, repr=False, compare=False
+        )
+
+    def __getstate__(self) -> tuple[ComponentProvider, dict[str, str]]:
+        return (self.provider, self.resolved_dependencies)
+
+    def __setstate__(self, state: tuple[ComponentProvider, dict[str, str]]) -> None:
+        # Bypasses the frozen __setattr__, and derives the other attributes afresh
+        # rather than copying the specialised invoker.
+        provider, resolved_dependencies = state
+        object.__setattr__(self, "provider", provider)
+        object.__setattr__(self, "resolved_dependencies", resolved_dependencies)
+        self.__post_init__()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "dependency_names",
+            tuple(dict.fromkeys(self.resolved_dependencies.values())),
+        )
+        object.__setattr__(
+            self,
+            "invoke",
+            _make_invoker(
+                (
+                    self.provider.instance
+                    if self.provider.memoize
+                    else self.provider.func
+                ),
+                self.resolved_dependencies,
+            ),
+        )
+
     @staticmethod
     def from_provider(
         provider: ComponentProvider, resolved_type_lookup: dict[type, str]
@@ -44,6 +106,47 @@ class ResolvedComponentProvider:
         )
 
 
+def _make_invoker(
+    func: Callable[..., Any], resolved_dependencies: dict[str, str]
+) -> Callable[[Mapping[str, Any]], Any]:
+    """Specialise a call to a provider function for its resolved dependencies.
+
+    Args:
+        func: The provider function.
+        resolved_dependencies: Mapping of parameter names to component names.
+
+    Returns:
+        A function taking a mapping of component names to components, which calls
+        the provider function with each parameter bound to its component.
+    """
+    if not resolved_dependencies:
+
+        def invoke_without_dependencies(dependencies):
+            return func()
+
+        return invoke_without_dependencies
+
+    if len(resolved_dependencies) == 1:
+        ((parameter_name, component_name),) = resolved_dependencies.items()
+
+        def invoke_with_dependency(dependencies):
+            return func(**{parameter_name: dependencies[component_name]})
+
+        return invoke_with_dependency
+
+    parameters = tuple(resolved_dependencies.items())
+
+    def invoke_with_dependencies(dependencies):
+        return func(
+            **{
+                parameter_name: dependencies[component_name]
+                for parameter_name, component_name in parameters
+            }
+        )
+
+    return invoke_with_dependencies
+
+
 @dataclass(frozen=True)
 class BundleManifest:
     """Description of how to build a :class:`~versatile.bundle.Bundle`."""
@@ -219,12 +322,11 @@ class BundleManifestBuilder:
         dependency_graph: _DependencyGraph = _DependencyGraph()
 
         for provider_name, resolved_provider in resolved_providers.items():
-            dependency_names = resolved_provider.resolved_dependencies.values()
             dependency_graph.add_dependencies(
                 provider_name,
                 (
                     dependency_name
-                    for dependency_name in dependency_names
+                    for dependency_name in resolved_provider.dependency_names
                     if not (
                         (self._parent and dependency_name in self._parent)
                         or dependency_name in provided_from_scope
@@ -21,7 +21,7 @@ class ComponentBuilder:
         self,
         transformers: list[Callable[[MaterialisedComponent], MaterialisedComponent]],
     ):
-        self._transformers = transformers
+        self._transform = _compose(transformers) if transformers else _untransformed
 
     def build(
         self, resolved_provider: ResolvedComponentProvider, dependencies: dict[str, Any]
@@ -35,22 +35,33 @@ class ComponentBuilder:
         Returns:
             The resulting :class:`MaterialisedComponent`.
         """
-        call_kwargs = {
-            parameter_name: dependencies[component_name]
-            for parameter_name, component_name in resolved_provider.resolved_dependencies.items()
-        }
-        component_obj = resolved_provider.provider.func(**call_kwargs)
-
-        untransformed = MaterialisedComponent(
-            uuid.uuid4(),
-            resolved_provider.provider.name,
-            resolved_provider.provider.provided_types,
-            component_obj,
-            list(dependencies.keys()),
-            resolved_provider.provider.metadata,
+        provider = resolved_provider.provider
+        return self._transform(
+            MaterialisedComponent(
+                uuid.uuid4(),
+                provider.name,
+                provider.provided_types,
+                resolved_provider.invoke(dependencies),
+                resolved_provider.dependency_names,
+                provider.metadata,
+            )
         )
+
+
+def _untransformed(component: MaterialisedComponent) -> MaterialisedComponent:
+    return component
+
+
+def _compose(
+    transformers: list[Callable[[MaterialisedComponent], MaterialisedComponent]],
+) -> Callable[[MaterialisedComponent], MaterialisedComponent]:
+    """Combine transformers into a single function applying each in turn."""
+
+    def transform(component: MaterialisedComponent) -> MaterialisedComponent:
         return reduce(
-            lambda component, transformer: transformer(component),
-            self._transformers,
-            untransformed,
+            lambda transformed, transformer: transformer(transformed),
+            transformers,
+            component,
         )
+
+    return transform
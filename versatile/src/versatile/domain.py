@@ -1,7 +1,7 @@
 """Domain models used throughout the framework."""
 
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Mapping, NamedTuple, Optional, Sequence
 from uuid import UUID
 
 
@@ -15,28 +15,42 @@ class Dependency:
         component_name: The name of the component that fulfils this dependency.
     """
 
+    # Declared by hand, since dataclass(slots=True) needs Python 3.10. As that
+    # would, state is restored without going through the frozen __setattr__, so
+    # that instances can still be copied and pickled.
+    __slots__ = ("parameter_name", "declared_type", "component_name")
+
     parameter_name: str
     declared_type: Optional[type]
     component_name: Optional[str]
 
+    def __getstate__(self):
+        return (self.parameter_name, self.declared_type, self.component_name)
 
-@dataclass(frozen=True)
-class MaterialisedComponent:
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+class MaterialisedComponent(NamedTuple):
     """
     Represents a resolved and instantiated component.
 
+    A named tuple rather than a frozen dataclass, since one is constructed for
+    every provider invoked when a bundle is built.
+
     Attributes:
         id: The unique id of this component instance.
         name: The provider name.
-        declared_types: List of types this component can satisfy.
+        declared_types: The types this component can satisfy.
         component: The instantiated component object.
-        dependencies: A list of provider names or keys this component depends on.
-        metadata: Optional metadata declared on the provider.
+        dependencies: The provider names or keys this component depends on.
+        metadata: Optional metadata declared on the provider (read-only when empty).
     """
 
     id: UUID
     name: str
-    declared_types: list[type]
+    declared_types: Sequence[type]
     component: Any
-    dependencies: list[str]
-    metadata: dict[str, Any]
+    dependencies: Sequence[str]
+    metadata: Mapping[str, Any]
@@ -8,7 +8,7 @@ providers ready for dependency graph analysis.
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import FrozenSet
+from typing import FrozenSet, Sequence
 
 from versatile.domain import Dependency
 from versatile.errors import DependencyError
@@ -37,7 +37,7 @@ class ProviderSet:
 
 
 def make_provider_set(
-    providers: list[ComponentProvider],
+    providers: Sequence[ComponentProvider],
     profiles: set[str],
     require_complete: bool = True,
 ) -> ProviderSet:
@@ -53,7 +53,7 @@ def make_provider_set(
         resolved due to multiple providers.
 
     Args:
-        providers: List of ComponentProvider instances to include.
+        providers: Sequence of ComponentProvider instances to include.
         profiles: Set of active profile names (used only for error context).
         require_complete: If True (default), then all providers' dependencies must be satisfiable by
         other providers in the resulting ProviderSet. If False, then dependencies may be satisfied
@@ -66,14 +66,7 @@ def make_provider_set(
         providers, profiles
     )
 
-    by_name_dependencies = {
-        dependency.component_name
-        for provider in providers
-        for dependency in provider.dependencies
-        if dependency.component_name is not None
-    }
-
-    by_type_dependencies = _by_type_dependencies(providers)
+    by_name_dependencies, by_type_dependencies = _partition_dependencies(providers)
     resolved_type_dependencies = _resolved_type_dependencies(
         by_type_dependencies, providers, profiles
     )
@@ -119,14 +112,19 @@ def _resolved_type_dependencies(by_type_dependencies, providers, profiles):
     Raises:
         DependencyError: If multiple providers can satisfy the same type dependency.
     """
+    resolved_type_dependencies: dict[type, str] = {}
+    if not by_type_dependencies:
+        return resolved_type_dependencies
+
+    # Only types that something depends on need indexing.
     providers_by_type: dict[type, set[str]] = defaultdict(set)
     for provider in providers:
         for provided_type in provider.provided_types:
-            providers_by_type[provided_type].add(provider.name)
+            if provided_type in by_type_dependencies:
+                providers_by_type[provided_type].add(provider.name)
 
-    resolved_type_dependencies: dict[type, str] = {}
     for depended_on_type, dependencies in by_type_dependencies.items():
-        provider_names = providers_by_type[depended_on_type]
+        provider_names = providers_by_type.get(depended_on_type, ())
         if len(provider_names) > 1:
             dependency_list = ", ".join(
                 f"{provider_name}.{dependency.parameter_name}"
@@ -142,19 +140,35 @@ def _resolved_type_dependencies(by_type_dependencies, providers, profiles):
     return resolved_type_dependencies
 
 
-def _by_type_dependencies(providers):
+def _partition_dependencies(providers):
+    """Split the providers' dependencies into by-name and by-type dependencies.
+
+    Both are collected in a single pass over the providers.
+
+    Args:
+        providers: List of providers whose dependencies are to be partitioned.
+
+    Returns:
+        A tuple of the set of depended-on component names, and a mapping from
+        depended-on types to the (provider name, dependency) pairs that need them.
+    """
+    by_name_dependencies: set[str] = set()
     by_type_dependencies: dict[type, set[tuple[str, Dependency]]] = defaultdict(set)
     for provider in providers:
+        provider_name = provider.name
         for dependency in provider.dependencies:
-            if dependency.component_name is None:
+            component_name = dependency.component_name
+            if component_name is not None:
+                by_name_dependencies.add(component_name)
+            else:
                 by_type_dependencies[dependency.declared_type].add(
-                    (provider.name, dependency)
+                    (provider_name, dependency)
                 )
-    return by_type_dependencies
+    return by_name_dependencies, by_type_dependencies
 
 
 def _providers_by_unique_name(
-    providers: list[ComponentProvider], profiles: set[str]
+    providers: Sequence[ComponentProvider], profiles: set[str]
 ) -> dict[str, ComponentProvider]:
     providers_by_name = {}
 
@@ -166,6 +180,6 @@ def _providers_by_unique_name(
                 f"for providers {[p.name for p in providers]} "
                 f"in profiles {profiles}"
             )
-        providers_by_name[provider.name] = provider
+        providers_by_name[provider_name] = provider
 
     return providers_by_name
@@ -1,8 +1,11 @@
 """Registration and introspection utilities for component providers."""
 
 import inspect
-from abc import abstractmethod
-from dataclasses import dataclass
+import sys
+from collections import defaultdict
+from dataclasses import FrozenInstanceError
+from types import FunctionType, GenericAlias, MethodType
+from weakref import WeakKeyDictionary
 from typing import (
     Callable,
     get_type_hints,
@@ -11,8 +14,9 @@ from typing import (
     get_args,
     Optional,
     Any,
-    Literal,
-    Union,
+    Mapping,
+    Sequence,
+    Iterable,
 )
 
 from versatile.domain import Dependency
@@ -24,8 +28,46 @@ __all__ = [
     "ComponentProviderRegistry",
 ]
 
+_MISSING = object()
+
+
+def _intern(value: str) -> str:
+    """Intern a string, if it can be.
+
+    Instances of str subclasses, such as members of str enums, cannot be
+    interned, so are returned as they are.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+class _EmptyMetadata(Mapping):
+    """Read-only empty metadata, shared by all providers registered without any.
+
+    Unlike an empty MappingProxyType, it can be copied and pickled, both of which
+    give back the shared instance.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __repr__(self):
+        return "{}"
+
+    def __reduce__(self):
+        return "_EMPTY_METADATA"
+
+
+_EMPTY_METADATA: Mapping[str, Any] = _EmptyMetadata()
+
 
-@dataclass(frozen=True)
 class ComponentProvider:
     """Encapsulates metadata about a registered component provider.
 
@@ -34,17 +76,29 @@ class ComponentProvider:
     to understand what the provider creates, what it depends on, and under
     what conditions it should be active.
 
+    Providers are immutable. If provided_types or dependencies is given as None,
+    it is derived from func when first read rather than when the provider is
+    created, so that providers which are never resolved (for example, because
+    their profiles are never selected) are never introspected.
+
     Attributes:
         name: Logical name of the component (may be derived from function name
             if not explicitly stated in the registration decorator).
         func: The callable providing the component (function or class constructor).
-        profiles: List of profile names under which the component is active.
-            Empty list means active in all profiles.
-        provided_types: List of types this provider can satisfy. For functions,
+        profiles: Tuple of profile names under which the component is active.
+            An empty tuple means active in all profiles.
+        provided_types: Tuple of types this provider can satisfy. For functions,
             contains the return type annotation (if present). For classes,
             contains the class itself plus all its base classes.
-        dependencies: List of Dependency objects describing what this provider needs.
-        metadata: Dictionary of arbitrary metadata attached to the provider.
+        dependencies: Tuple of Dependency objects describing what this provider needs.
+        metadata: Mapping of arbitrary metadata attached to the provider. Providers
+            registered without metadata share a single read-only empty mapping.
+        memoize: Whether the component created by the first call to ``instance``
+            is reused by every later call.
+        included_profiles: The profiles in ``profiles`` under which the provider is
+            active, derived when the provider is created.
+        excluded_profiles: The profiles excluded by "!"-prefixed entries in
+            ``profiles``, without the "!", derived when the provider is created.
 
     Example:
         >>> @registry.provides(name="database", profiles=["prod"])
@@ -54,24 +108,152 @@ class ComponentProvider:
         >>> # Creates ComponentProvider with:
         >>> # - name: "database"
         >>> # - func: make_database
-        >>> # - profiles: ["prod"]
-        >>> # - provided_types: [Database]
-        >>> # - dependencies: []
+        >>> # - profiles: ("prod",)
+        >>> # - provided_types: (Database,)
+        >>> # - dependencies: ()
 
         >>> @registry.provides()
         >>> class UserService(Service):
         ...     pass
         >>>
         >>> # Creates ComponentProvider with:
-        >>> # - provided_types: [UserService, Service, object]
+        >>> # - provided_types: (UserService, Service)
     """
 
+    __slots__ = (
+        "name",
+        "func",
+        "profiles",
+        "_provided_types",
+        "_dependencies",
+        "metadata",
+        "memoize",
+        "_instance",
+        "included_profiles",
+        "excluded_profiles",
+    )
+
     name: str
-    func: Callable
-    profiles: list[str]
-    provided_types: list[type]
-    dependencies: list[Dependency]
-    metadata: dict[str, Any]
+    func: Callable[..., Any]
+    profiles: tuple[str, ...]
+    _provided_types: Optional[tuple[type, ...]]
+    _dependencies: Optional[tuple[Dependency, ...]]
+    metadata: Mapping[str, Any]
+    memoize: bool
+    _instance: Any
+    included_profiles: frozenset[str]
+    excluded_profiles: frozenset[str]
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        profiles: tuple[str, ...],
+        provided_types: Optional[tuple[type, ...]],
+        dependencies: Optional[tuple[Dependency, ...]],
+        metadata: Mapping[str, Any],
+        memoize: bool = False,
+    ):
+        set_attribute = object.__setattr__
+        # Interned, as component names are used throughout as dictionary keys.
+        set_attribute(self, "name", _intern(name))
+        set_attribute(self, "func", func)
+        set_attribute(self, "profiles", profiles)
+        set_attribute(self, "_provided_types", provided_types)
+        set_attribute(self, "_dependencies", dependencies)
+        set_attribute(self, "metadata", metadata)
+        set_attribute(self, "memoize", memoize)
+        set_attribute(self, "_instance", _MISSING)
+        # Parse the profile patterns once, rather than on every profile query.
+        # Profile names are interned so that set lookups against the selected
+        # profiles can usually succeed on identity.
+        included, excluded = [], []
+        for profile in profiles:
+            if profile.startswith("!"):
+                excluded.append(_intern(profile[1:]))
+            else:
+                included.append(_intern(profile))
+        set_attribute(self, "included_profiles", frozenset(included))
+        set_attribute(self, "excluded_profiles", frozenset(excluded))
+
+    @property
+    def provided_types(self) -> tuple[type, ...]:
+        provided_types = self._provided_types
+        if provided_types is None:
+            provided_types = _get_provided_types(self.func)
+            object.__setattr__(self, "_provided_types", provided_types)
+        return provided_types
+
+    @property
+    def dependencies(self) -> tuple[Dependency, ...]:
+        dependencies = self._dependencies
+        if dependencies is None:
+            dependencies = _get_dependencies(self.func)
+            object.__setattr__(self, "_dependencies", dependencies)
+        return dependencies
+
+    def instance(self, *args: Any, **kwargs: Any) -> Any:
+        """Call the provider to create its component.
+
+        If the provider is memoized, the component created by the first call is
+        returned by every later call, whatever arguments are passed.
+        """
+        if not self.memoize:
+            return self.func(*args, **kwargs)
+        instance = self._instance
+        if instance is _MISSING:
+            instance = self.func(*args, **kwargs)
+            object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        # A memoized instance is not carried over: copies create their own.
+        return (
+            self.name,
+            self.func,
+            self.profiles,
+            self._provided_types,
+            self._dependencies,
+            self.metadata,
+            self.memoize,
+        )
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        # Restored through __init__, so as to bypass the frozen __setattr__ and
+        # re-derive the parsed profiles.
+        ComponentProvider.__init__(self, *state)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    # Comparison and repr use the stored values, so that neither forces (or fails
+    # on) the analysis a lazy provider defers.
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __hash__(self) -> int:
+        # Only fields which are never filled in later, so that a lazy provider's
+        # hash does not change when it is analysed.
+        return hash((self.name, self.func, self.profiles, self.memoize))
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(name={self.name!r}, func={self.func!r}, "
+            f"profiles={self.profiles!r}, "
+            f"provided_types={_lazy_repr(self._provided_types)}, "
+            f"dependencies={_lazy_repr(self._dependencies)}, "
+            f"metadata={self.metadata!r}, memoize={self.memoize!r})"
+        )
+
+
+def _lazy_repr(value: Any) -> str:
+    return "<not yet analysed>" if value is None else repr(value)
 
 
 def inferred_name(target: Any) -> str:
@@ -88,13 +270,10 @@ def inferred_name(target: Any) -> str:
         >>> inferred_name(make_database)  # Returns "database"
         >>> inferred_name(my_service)     # Returns "my_service"
     """
-    if inspect.isclass(target):
+    if isinstance(target, type):
         return target.__name__
 
-    if target.__name__.startswith("make_"):
-        return target.__name__[5:]
-    else:
-        return target.__name__
+    return target.__name__.removeprefix("make_")
 
 
 def name_from_supertype(target: Any) -> str:
@@ -113,7 +292,7 @@ def name_from_supertype(target: Any) -> str:
         >>> class DatabaseService(Service): ...
         >>> name_from_supertype(DatabaseService)  # Returns "<class 'Service'>"
     """
-    if not inspect.isclass(target):
+    if not isinstance(target, type):
         raise ValueError(f"{target} is not a class")
     return str(target.__bases__[0])
 
@@ -123,6 +302,17 @@ class ComponentProviderRegistry:
 
     def __init__(self):
         self._providers = []
+        # Indices into _providers of providers active regardless of the selected
+        # profiles (barring exclusions), of providers active under each
+        # included profile, and of providers inactive under each excluded one.
+        self._unconstrained: list[int] = []
+        self._by_included_profile: dict[str, list[int]] = defaultdict(list)
+        self._by_excluded_profile: dict[str, set[int]] = defaultdict(set)
+        self._has_profiles = False
+        self._matching_cache: dict[frozenset[str], tuple[ComponentProvider, ...]] = {}
+        self._snapshot: Optional[tuple[ComponentProvider, ...]] = None
+        # Providers with each name, in registration order.
+        self._by_name: dict[str, list[ComponentProvider]] = defaultdict(list)
 
     def register(self, provider: ComponentProvider):
         """Register a component explicitly.
@@ -130,25 +320,115 @@ class ComponentProviderRegistry:
         Args:
             provider: The Component instance to be registered.
         """
+        self._add(provider)
+        self._invalidate()
+
+    def register_all(self, providers: Iterable[ComponentProvider]):
+        """Register several components explicitly, in order.
+
+        Cached query results are discarded once for the whole batch, rather than
+        once per component.
+
+        Args:
+            providers: The Component instances to be registered.
+        """
+        try:
+            for provider in providers:
+                self._add(provider)
+        finally:
+            # Also reached if providers fails part way, after adding some.
+            self._invalidate()
+
+    def _invalidate(self):
+        self._matching_cache.clear()
+        self._snapshot = None
+
+    def _add(self, provider: ComponentProvider):
+        index = len(self._providers)
         self._providers.append(provider)
+        self._by_name[provider.name].append(provider)
+        if provider.profiles:
+            self._has_profiles = True
+        if provider.included_profiles:
+            for profile in provider.included_profiles:
+                self._by_included_profile[profile].append(index)
+        else:
+            self._unconstrained.append(index)
+        for profile in provider.excluded_profiles:
+            self._by_excluded_profile[profile].add(index)
+
+    def get(self, name: str, profiles: set[str] = None) -> ComponentProvider:
+        """Retrieve a registered component by name.
+
+        Args:
+            name: The name of the component.
+            profiles: A set of active profile names. If None, profiles are ignored.
+
+        Returns:
+            The first registered component with the given name whose profiles
+            match the given profile set.
+
+        Raises:
+            KeyError: If there is no such component.
+        """
+        for provider in self._by_name.get(name, ()):
+            if profiles is None or _profiles_match(provider, profiles):
+                return provider
+        raise KeyError(name)
 
     def registered_providers(
         self, profiles: set[str] = None
-    ) -> list[ComponentProvider]:
+    ) -> Sequence[ComponentProvider]:
         """Retrieve components, optionally filtered by active profiles.
 
+        Results are cached, per distinct set of profiles when filtered, until
+        another provider is registered, and are returned as tuples so that the
+        cached results cannot be modified by callers. Profile names are interned when a
+        new set of profiles is filtered, so callers need not intern them.
+
         Args:
             profiles: A set of active profile names. If None, returns all components.
+                A frozenset is used as the cache key as it is, so callers querying
+                the same profiles repeatedly can pass one to avoid a copy.
 
         Returns:
-            A list of components whose profiles match the given profile set.
+            The components whose profiles match the given profile set.
         """
-        if profiles is None:
-            return self._providers
-        return [c for c in self._providers if _profiles_match(c.profiles, profiles)]
+        if profiles is None or not self._has_profiles:
+            snapshot = self._snapshot
+            if snapshot is None:
+                snapshot = self._snapshot = tuple(self._providers)
+            return snapshot
+
+        key = frozenset(profiles)
+        matching = self._matching_cache.get(key)
+        if matching is None:
+            matching = self._matching_cache[key] = self._matching_providers(key)
+        return matching
+
+    def _matching_providers(
+        self, profiles: frozenset[str]
+    ) -> tuple[ComponentProvider, ...]:
+        profiles = frozenset(map(_intern, profiles))
+        if len(profiles) > len(self._by_included_profile):
+            # Cheaper to scan every provider than to union this many buckets.
+            return tuple(c for c in self._providers if _profiles_match(c, profiles))
+
+        candidates = set(self._unconstrained)
+        for profile in profiles:
+            candidates.update(self._by_included_profile.get(profile, ()))
+        for profile in profiles:
+            candidates.difference_update(self._by_excluded_profile.get(profile, ()))
+
+        providers = self._providers
+        return tuple(providers[index] for index in sorted(candidates))
 
     def provides(
-        self, name: Optional[str] = None, profiles: Optional[list[str]] = None
+        self,
+        name: Optional[str] = None,
+        profiles: Optional[list[str]] = None,
+        lazy: bool = False,
+        memoize: bool = False,
     ) -> Callable:
         """Decorator to register a function as a component provider.
 
@@ -156,6 +436,13 @@ class ComponentProviderRegistry:
             name: Optional logical name to assign; defaults to function name with 'make_'
                 prefix removed.
             profiles: Optional list of profiles for which the component is active.
+            lazy: If True, defer analysing the provider's type annotations until its
+                dependencies or provided types are first needed. Registration is
+                cheaper, but annotation errors surface when bundles are built
+                rather than when the provider is declared.
+            memoize: If True, create the component only once, and reuse it in every
+                bundle built afterwards. Only suitable for components which do not
+                depend on their bundle's dependencies or profiles.
 
         Returns:
             A decorator that registers the function as a component.
@@ -165,14 +452,18 @@ class ComponentProviderRegistry:
             def make_thing() -> Thing:
                 return Thing()
         """
-        profiles = profiles or []
+        profiles = _shared_profiles(profiles) if profiles else ()
 
         def decorator(obj):
             provided_name = name or inferred_name(obj)
-            if inspect.isclass(obj):
-                provider = _make_class_provider(obj, provided_name, profiles)
-            elif inspect.isfunction(obj):
-                provider = _make_function_provider(obj, provided_name, profiles)
+            if isinstance(obj, type):
+                provider = _make_class_provider(
+                    obj, provided_name, profiles, lazy, memoize
+                )
+            elif isinstance(obj, FunctionType):
+                provider = _make_function_provider(
+                    obj, provided_name, profiles, lazy, memoize
+                )
             else:
                 raise DependencyError(f"{obj} is not a class or function")
 
@@ -182,38 +473,62 @@ class ComponentProviderRegistry:
         return decorator
 
 
+# Tuples of plain string profiles as declared, so that providers declared with
+# equal profiles share a single tuple.
+_PROFILES: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def _shared_profiles(profiles: Iterable[str]) -> tuple[str, ...]:
+    profiles = tuple(profiles)
+    if not all(type(profile) is str for profile in profiles):
+        # Instances of str subclasses, such as str enum members, equal plain
+        # strings, so sharing would swap one for the other. Keep them as declared.
+        return profiles
+    shared = _PROFILES.get(profiles)
+    if shared is None:
+        shared = _PROFILES[profiles] = tuple(map(_intern, profiles))
+    return shared
+
+
 def _make_class_provider(
-    cls: Any, component_name: str, profiles: list[str]
+    cls: Any,
+    component_name: str,
+    profiles: tuple[str, ...],
+    lazy: bool = False,
+    memoize: bool = False,
 ) -> ComponentProvider:
     """Create a ComponentProvider from a class by wrapping it with @dataclass.
 
-    For classes, the provided_types list includes the class itself and all its base classes,
+    For classes, the provided_types tuple includes the class itself and all its base classes,
     allowing the class to satisfy dependencies for any of its parent types.
 
     Args:
         cls: The class to convert to a provider.
         component_name: the name to give the provided component.
         profiles: List of profiles for which the provider is active.
+        lazy: Whether to defer analysing the class's dependencies until first use.
+        memoize: Whether to create the component only once.
 
     Returns:
         ComponentProvider wrapping the dataclass-decorated class with full type hierarchy.
     """
-
-    # Get the class hierarchy: the class itself plus all its base classes
-    provided_types = [cls] + list(cls.__bases__)
-
     return ComponentProvider(
         component_name,
         cls,
         profiles,
-        provided_types,
-        _get_dependencies(cls),
-        getattr(cls, "__provider_metadata__", {}),
+        _get_provided_types(cls),
+        None if lazy else _get_dependencies(cls),
+        getattr(cls, "__provider_metadata__", _EMPTY_METADATA),
+        memoize,
     )
 
 
 def _make_function_provider(
-    func: Callable, component_name: str, profiles: list[str]
+    func: Callable,
+    component_name: str,
+    profiles: tuple[str, ...],
+    lazy: bool = False,
+    memoize: bool = False,
 ) -> ComponentProvider:
     """Create a ComponentProvider from a function.
 
@@ -221,24 +536,48 @@ def _make_function_provider(
         func: The function to convert to a provider.
         component_name: the name to give the provided component.
         profiles: List of profiles for which the provider is active.
+        lazy: Whether to defer analysing the function's return type and
+            dependencies until first use.
+        memoize: Whether to create the component only once.
 
     Returns:
         ComponentProvider with analyzed dependencies and metadata.
     """
-    return_type = get_type_hints(func).get("return", None)
-    provided_types = [return_type] if return_type is not None else []
-
+    if lazy:
+        provided_types = dependencies = None
+    else:
+        dependencies, return_type = _analyze_signature(func)
+        provided_types = (return_type,) if return_type is not None else ()
     return ComponentProvider(
         component_name,
         func,
         profiles,
         provided_types,
-        _get_dependencies(func),
-        getattr(func, "__provider_metadata__", {}),
+        dependencies,
+        getattr(func, "__provider_metadata__", _EMPTY_METADATA),
+        memoize,
     )
 
 
-def _profiles_match(stated: list[str], selected: set[str]) -> bool:
+def _get_provided_types(func: Callable) -> tuple[type, ...]:
+    """Determine the types a provider can satisfy.
+
+    Args:
+        func: The provider function or class.
+
+    Returns:
+        For classes, the class itself followed by its base classes. For functions,
+        the annotated return type, or an empty tuple if there is none.
+    """
+    if isinstance(func, type):
+        # The class hierarchy: the class itself plus all its base classes
+        return (func, *func.__bases__)
+
+    return_type = _analyze_signature(func)[1]
+    return (return_type,) if return_type is not None else ()
+
+
+def _profiles_match(provider: ComponentProvider, selected: set[str]) -> bool:
     """Check if a provider's profile requirements match the selected profiles.
 
     Profile matching supports inclusion and exclusion patterns:
@@ -247,27 +586,69 @@ def _profiles_match(stated: list[str], selected: set[str]) -> bool:
     - Empty stated profiles match all selected profiles
 
     Args:
-        stated: List of profile patterns from the provider.
+        provider: The provider, with its profile patterns already parsed into
+            included and excluded profile sets.
         selected: Set of currently active profile names.
 
     Returns:
         True if the provider should be active for the selected profiles.
 
     Example:
-        >>> _profiles_match(["dev"], {"dev"})          # True
-        >>> _profiles_match(["!test"], {"dev"})        # True
-        >>> _profiles_match(["!test"], {"test"})       # False
-        >>> _profiles_match(["prod"], {"dev"})         # False
+        >>> # dev_provider has profiles ["dev"], not_test_provider has ["!test"]
+        >>> _profiles_match(dev_provider, {"dev"})         # True
+        >>> _profiles_match(not_test_provider, {"dev"})    # True
+        >>> _profiles_match(not_test_provider, {"test"})   # False
+        >>> _profiles_match(dev_provider, {"prod"})        # False
     """
-    provided = [p for p in stated if not p.startswith("!")]
-    excluded = [p[1:] for p in stated if p.startswith("!")]
+    included = provider.included_profiles
+    return provider.excluded_profiles.isdisjoint(selected) and (
+        not included or not included.isdisjoint(selected)
+    )
+
+
+def _parameter_names(func: Callable) -> tuple[str, ...]:
+    """Names of a provider's parameters in declaration order."""
+    if isinstance(func, FunctionType) and _takes_no_arguments(func):
+        return ()
+    return tuple(_signature(func).parameters)
 
-    return not any(e in selected for e in excluded) and (
-        not provided or any(p in selected for p in provided)
+
+def _takes_no_arguments(func: FunctionType) -> bool:
+    """Whether a function has no parameters, judged from its code object alone.
+
+    Functions whose signature inspect.signature would take from elsewhere
+    (wrappers and functions with a ``__signature__``) are never judged so.
+    """
+    code = func.__code__
+    return not (
+        code.co_argcount
+        or code.co_kwonlyargcount
+        or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+        or hasattr(func, "__wrapped__")
+        or hasattr(func, "__signature__")
     )
 
 
-def _get_dependencies(func: Callable) -> list[Dependency]:
+def _signature(func: Callable) -> inspect.Signature:
+    """Signature of a provider, using its precomputed ``__signature__`` if it has one.
+
+    inspect.signature would return the same object, but only after working out
+    what kind of callable it has been given.
+    """
+    signature = getattr(func, "__signature__", None)
+    # Bound methods expose their function's __signature__, which still
+    # includes the bound parameter.
+    if isinstance(signature, inspect.Signature) and not isinstance(func, MethodType):
+        return signature
+    return inspect.signature(func)
+
+
+# Before Python 3.11, get_type_hints turns the annotation of a parameter that
+# defaults to None into an Optional.
+_IMPLICIT_OPTIONAL = sys.version_info < (3, 11)
+
+
+def _get_dependencies(func: Callable) -> tuple[Dependency, ...]:
     """Extract dependency information from a function's type annotations.
 
     Analyzes the function signature to create Dependency objects for each
@@ -278,20 +659,181 @@ def _get_dependencies(func: Callable) -> list[Dependency]:
         func: The function to analyze for dependencies.
 
     Returns:
-        List of Dependency objects describing each parameter.
+        Tuple of Dependency objects describing each parameter.
 
     Example:
         >>> def service(untyped, db: Database, cache: Annotated[Cache, "redis"]) -> Service:
         ...     pass
         >>> deps = _get_dependencies(service)
         >>> # Returns:
-        >>> # [Dependency("untyped", None, "untyped"),
+        >>> # (Dependency("untyped", None, "untyped"),
         >>> #  Dependency("db", Database, "<class 'Database'>"),
-        >>> #  Dependency("cache", Cache, "redis")]
+        >>> #  Dependency("cache", Cache, "redis"))
     """
-    sig = inspect.signature(func)
-    hints = get_type_hints(func, include_extras=True)
-    return [_make_dependency(hints.get(name), name) for name in sig.parameters]
+    return _analyze_signature(func)[0]
+
+
+def _function_hints(func: FunctionType) -> dict[str, Any]:
+    """Type hints of a function, read directly from its annotations where possible.
+
+    When every annotation is already a class, or an ``Annotated`` class,
+    get_type_hints would return them unchanged, so there is no need to call it.
+    The returned dictionary may be the function's own ``__annotations__``, so must
+    not be modified.
+    """
+    annotations = func.__annotations__
+    if _IMPLICIT_OPTIONAL and _has_none_default(func):
+        return get_type_hints(func, include_extras=True)
+    if all(map(_is_resolved, annotations.values())):
+        return annotations
+    return get_type_hints(func, include_extras=True)
+
+
+def _is_resolved(annotation: Any) -> bool:
+    """Whether get_type_hints would leave an annotation as it is."""
+    if get_origin(annotation) is Annotated:
+        annotation = get_args(annotation)[0]
+    # Before Python 3.11, generic aliases such as list["Foo"] pass for classes,
+    # but may hold forward references.
+    return isinstance(annotation, type) and not isinstance(annotation, GenericAlias)
+
+
+def _has_none_default(func: FunctionType) -> bool:
+    defaults = func.__defaults__ or ()
+    kwdefaults = func.__kwdefaults__ or {}
+    return any(default is None for default in defaults) or any(
+        default is None for default in kwdefaults.values()
+    )
+
+
+# A provider's dependencies and its return type.
+_SignatureAnalysis = tuple[tuple[Dependency, ...], Optional[type]]
+
+# Weakly keyed, so that providers created at runtime (closures, classes defined
+# in tests) can still be garbage collected.
+_SIGNATURE_ANALYSES: "WeakKeyDictionary[Callable, _SignatureAnalysis]" = (
+    WeakKeyDictionary()
+)
+
+
+def _analyze_signature(func: Callable) -> _SignatureAnalysis:
+    """Extract a provider's dependencies and return type, analysing each provider once.
+
+    Args:
+        func: The provider function or class to analyze.
+
+    Returns:
+        The dependencies, as returned by _get_dependencies, and the annotated return
+        type without any ``Annotated`` metadata. The return type is None for classes
+        and for functions with no return annotation.
+
+        A provider with its own ``__dependencies__`` attribute declares its own
+        dependencies, which are used as given. The attribute is not inherited:
+        a subclass's constructor may take different parameters from its base's.
+
+    Raises:
+        DependencyError: If the provider's declared dependencies do not match
+            its signature (see _check_declared_dependencies).
+    """
+    declared_dependencies = getattr(func, "__dict__", {}).get("__dependencies__")
+    if declared_dependencies is not None:
+        # The provider states its own dependencies, so its parameters' annotations
+        # need not be analysed.
+        dependencies = tuple(declared_dependencies)
+        _check_declared_dependencies(func, dependencies)
+        return _analyze_type_hints(func, dependencies)
+
+    try:
+        analysis = _SIGNATURE_ANALYSES.get(func)
+    except TypeError:
+        # Not weakly referenceable, so cannot be cached.
+        return _analyze_type_hints(func)
+
+    if analysis is None:
+        analysis = _SIGNATURE_ANALYSES[func] = _analyze_type_hints(func)
+    return analysis
+
+
+def _check_declared_dependencies(
+    func: Callable[..., Any], dependencies: tuple[Dependency, ...]
+) -> None:
+    """Check that a provider's declared dependencies fit its signature.
+
+    Bundles always pass dependencies to providers by keyword, so each must name
+    a parameter that can be passed by keyword (unless the provider takes ``**``
+    keyword arguments), and every required parameter must be declared.
+
+    Raises:
+        DependencyError: If a declared dependency is not a Dependency, names a
+            parameter the provider cannot accept by keyword, or a required
+            parameter has no declared dependency.
+    """
+    for dependency in dependencies:
+        if not isinstance(dependency, Dependency):
+            raise DependencyError(
+                f"Provider {func.__name__} declares dependency {dependency!r}, "
+                "which is not a Dependency"
+            )
+
+    parameters = _signature(func).parameters.values()
+    keyword_names = {
+        parameter.name
+        for parameter in parameters
+        if parameter.kind
+        in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    }
+    declared_names = {dependency.parameter_name for dependency in dependencies}
+    supplied_names = keyword_names & declared_names
+    for parameter in parameters:
+        if (
+            parameter.default is inspect.Parameter.empty
+            and parameter.kind
+            not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+            and parameter.name not in supplied_names
+        ):
+            raise DependencyError(
+                f"Provider {func.__name__} does not declare a dependency for its "
+                f"required parameter '{parameter.name}'"
+            )
+
+    if any(parameter.kind is inspect.Parameter.VAR_KEYWORD for parameter in parameters):
+        return
+    unaccepted_names = declared_names - keyword_names
+    if unaccepted_names:
+        raise DependencyError(
+            f"Provider {func.__name__} declares dependencies "
+            f"{sorted(unaccepted_names)}, but has no parameters that accept them "
+            "as keyword arguments"
+        )
+
+
+def _analyze_type_hints(
+    func: Callable, dependencies: Optional[tuple[Dependency, ...]] = None
+) -> _SignatureAnalysis:
+    """Derive a provider's dependencies and return type, resolving its type hints once.
+
+    If dependencies are given, only the return type is derived.
+    """
+    hints = None
+    return_type = None
+    if isinstance(func, FunctionType):
+        hints = _function_hints(func)
+        return_type = hints.get("return")
+        if get_origin(return_type) is Annotated:
+            return_type = get_args(return_type)[0]
+
+    if dependencies is None:
+        parameter_names = _parameter_names(func)
+        if hints is None:
+            # A class, whose annotated fields give its parameters' types.
+            if parameter_names:
+                hints = get_type_hints(func, include_extras=True)
+            else:
+                hints = {}
+        dependencies = tuple(
+            _make_dependency(hints.get(name), name) for name in parameter_names
+        )
+    return dependencies, return_type
 
 
 def _make_dependency(annotation, name) -> Dependency:
@@ -299,9 +841,13 @@ def _make_dependency(annotation, name) -> Dependency:
         return Dependency(name, None, name)
 
     if get_origin(annotation) is Annotated:
-        base_type, *metadata = get_args(annotation)
-        component_name = next((m for m in metadata), None)
-        return Dependency(name, base_type, component_name)
+        # Annotated always carries at least one metadata item after the base type.
+        args = get_args(annotation)
+        qualifier = args[1]
+        if isinstance(qualifier, str):
+            # Looked up among component names, which are interned.
+            qualifier = _intern(qualifier)
+        return Dependency(name, args[0], qualifier)
     else:
         return Dependency(name, annotation, None)
 
@@ -318,8 +864,12 @@ def _get_name_from_return_type(func: Callable) -> str:
     Raises:
         DependencyError: If the function has no return type annotation.
     """
-    return_type = get_type_hints(func).get("return", None)
-    if return_type is not None:
+    return_type = getattr(func, "__annotations__", {}).get("return", _MISSING)
+    if return_type is not _MISSING and not isinstance(return_type, type):
+        # Strings, forward references, None and typing constructs still need
+        # get_type_hints to evaluate and normalise them.
+        return_type = _analyze_signature(func)[1]
+    if return_type is not _MISSING:
         return str(return_type)
     raise DependencyError(
         f"Function {func.__name__} is decorated with @provides_type "
@@ -1,9 +1,12 @@
+import copy
 from dataclasses import dataclass
 from typing import Callable, Any, Annotated
 
 import pytest
 
 from versatile.builders import make_bundle
+from versatile.bundle_manifest import ResolvedComponentProvider
+from versatile.domain import Dependency
 from versatile.errors import DependencyError
 from versatile.registry import ComponentProviderRegistry
 
@@ -199,6 +202,42 @@ def test_keyword_only_dependency():
     assert bundle["bar"] == "bar-foo"
 
 
+def test_memoized_component_is_shared_between_bundles():
+    registry = ComponentProviderRegistry()
+
+    @registry.provides("shared", memoize=True)
+    def make_shared() -> list:
+        return []
+
+    @registry.provides("unshared")
+    def make_unshared() -> dict:
+        return {}
+
+    first, second = make_bundle(registry), make_bundle(registry)
+    assert first["shared"] is second["shared"]
+    assert first["unshared"] is not second["unshared"]
+
+
+def test_declared_dependencies_are_supplied_by_keyword():
+    registry = ComponentProviderRegistry()
+
+    @registry.provides("greeting")
+    def make_greeting() -> str:
+        return "Hello"
+
+    def make_message(**components) -> str:
+        return f"{components['greeting']}, {components['audience']}"
+
+    make_message.__dependencies__ = (
+        Dependency("greeting", None, "greeting"),
+        Dependency("audience", None, "audience"),
+    )
+    registry.provides("message")(make_message)
+
+    bundle = make_bundle(registry, scope={"audience": "world"})
+    assert bundle["message"] == "Hello, world"
+
+
 def test_scope_supplies_required_dependencies():
     registry = ComponentProviderRegistry()
 
@@ -304,3 +343,18 @@ def test_raises_if_child_provider_aliases_parent_type_for_satisfied_dependency()
         match=r"Provider types .* alias types also provided by parent bundle",
     ):
         make_bundle(child_registry, parent=parent_bundle)
+
+
+def test_resolved_providers_can_be_copied():
+    registry = ComponentProviderRegistry()
+
+    @registry.provides("greeting")
+    def make_greeting(name: Annotated[str, "name"]) -> str:
+        return f"Hello {name}"
+
+    resolved = ResolvedComponentProvider.from_provider(registry.get("greeting"), {})
+
+    for copied in copy.copy(resolved), copy.deepcopy(resolved):
+        assert copied == resolved
+        assert copied.dependency_names == ("name",)
+        assert copied.invoke({"name": "world"}) == "Hello world"
@@ -1,4 +1,9 @@
+import copy
+import gc
+import pickle
+import weakref
 from dataclasses import dataclass
+from enum import Enum
 from typing import Callable, Annotated
 
 import pytest
@@ -18,10 +23,7 @@ def registry():
 
 @pytest.fixture
 def component_finder(registry):
-    def find(name: str) -> ComponentProvider:
-        return next(c for c in registry.registered_providers() if c.name == name)
-
-    return find
+    return registry.get
 
 
 @pytest.fixture
@@ -29,7 +31,7 @@ def greeter(registry, component_finder):
     @registry.provides(name="greeter", profiles=["test1"])
     def make_greeter() -> Callable[[str], str]:
         def greeter(name: str) -> str:
-            return "Hello %s" % name
+            return f"Hello {name}"
 
         return greeter
 
@@ -43,7 +45,7 @@ def uppercase_greeter(registry, component_finder):
         greeter: Annotated[Callable[[str], str], "greeter"],
     ) -> Callable[[str], str]:
         def uppercase_greeter(name: str) -> str:
-            return (greeter(name)).upper()
+            return greeter(name).upper()
 
         return uppercase_greeter
 
@@ -51,9 +53,9 @@ def uppercase_greeter(registry, component_finder):
 
 
 def test_provider_is_registered(greeter: ComponentProvider):
-    assert greeter.profiles == ["test1"]
+    assert greeter.profiles == ("test1",)
     assert greeter.func()("Dominic") == "Hello Dominic"
-    assert greeter.provided_types == [Callable[[str], str]]
+    assert greeter.provided_types == (Callable[[str], str],)
 
 
 def test_name_can_be_resolved_from_declaring_function_name(
@@ -69,7 +71,7 @@ def test_provider_can_have_no_return_type(
     def make_foo():
         pass
 
-    assert component_finder("foo").provided_types == []
+    assert component_finder("foo").provided_types == ()
 
 
 def test_dependencies_can_be_identified_by_annotated_name(registry):
@@ -77,7 +79,6 @@ def test_dependencies_can_be_identified_by_annotated_name(registry):
     def foo(name: Annotated[str, "bar"]) -> str:
         pass
 
-    print(registry.registered_providers())
     assert registry.registered_providers()[0].dependencies[0].component_name == "bar"
 
 
@@ -109,7 +110,7 @@ def test_retrieve_components_by_profile(registry):
         pass
 
     def components_in(*profiles):
-        return {c.name for c in registry.registered_providers(set(profiles))}
+        return {c.name for c in registry.registered_providers(frozenset(profiles))}
 
     assert components_in() == {"globally_defined", "not_test"}
     assert components_in("test") == {"globally_defined", "test_only"}
@@ -118,6 +119,61 @@ def test_retrieve_components_by_profile(registry):
     assert components_in("empty") == {"globally_defined", "not_test"}
 
 
+def test_filtered_components_keep_registration_order(registry):
+    @registry.provides(profiles=["b"])
+    def first():
+        pass
+
+    @registry.provides()
+    def second():
+        pass
+
+    @registry.provides(profiles=["a", "!c"])
+    def third():
+        pass
+
+    def names_in(*profiles):
+        return [c.name for c in registry.registered_providers(frozenset(profiles))]
+
+    assert names_in("a", "b") == ["first", "second", "third"]
+    assert names_in("a", "b", "c", "d") == ["first", "second"]
+
+
+def test_filtered_components_are_refreshed_on_registration(registry):
+    @registry.provides(profiles=["test"])
+    def test_only():
+        pass
+
+    assert registry.registered_providers({"test"}) is registry.registered_providers(
+        {"test"}
+    )
+
+    @registry.provides(profiles=["!prod"])
+    def not_prod():
+        pass
+
+    assert [c.name for c in registry.registered_providers({"test"})] == [
+        "test_only",
+        "not_prod",
+    ]
+
+
+def test_all_components_are_refreshed_on_registration(registry):
+    @registry.provides()
+    def first():
+        pass
+
+    providers = registry.registered_providers()
+    assert providers is registry.registered_providers()
+
+    @registry.provides()
+    def second():
+        pass
+
+    assert [c.name for c in providers] == ["first"]
+    assert [c.name for c in registry.registered_providers()] == ["first", "second"]
+
+
 def test_unannotated_parameter_maps_to_untyped_dependency_with_parameter_name(registry):
     @registry.provides()
     def make_foo(_ignored):
@@ -136,7 +192,7 @@ def test_registers_class_by_name(registry):
 
     provider = registry.registered_providers()[0]
     assert provider.name == "user_service"
-    assert provider.dependencies == [Dependency("user_name", str, "user_name")]
+    assert provider.dependencies == (Dependency("user_name", str, "user_name"),)
 
     built = provider.func("Bob")
     assert built.user_name == "Bob"
@@ -149,3 +205,231 @@ def test_registers_class_by_type(registry):
 
     provider = registry.registered_providers()[0]
     assert provider.name == "UserService"
+
+
+def test_lazy_provider_defers_annotation_analysis(registry):
+    @registry.provides(lazy=True)
+    def make_foo(bar: "Undefined") -> str:  # noqa: F821
+        pass
+
+    provider = registry.registered_providers()[0]
+    assert provider.name == "foo"
+    assert "dependencies=<not yet analysed>" in repr(provider)
+    assert copy.copy(provider) == provider
+    with pytest.raises(NameError):
+        _ = provider.dependencies
+
+
+def test_lazy_provider_matches_eager_provider(registry):
+    def make_foo(bar: Annotated[str, "bar"], baz: int) -> str:
+        pass
+
+    registry.provides(name="eager")(make_foo)
+    registry.provides(name="lazy", lazy=True)(make_foo)
+    eager, lazy = registry.registered_providers()
+
+    assert lazy.provided_types == eager.provided_types == (str,)
+    assert lazy.dependencies == eager.dependencies
+
+
+def test_declared_dependencies_are_used_as_given(registry):
+    @registry.provides()
+    def make_service(**components: str) -> str:
+        pass
+
+    make_service.__dependencies__ = (Dependency("name", str, "name"),)
+    registry.provides(name="declared")(make_service)
+
+    provider = registry.registered_providers()[1]
+    assert provider.dependencies == (Dependency("name", str, "name"),)
+    assert provider.provided_types == (str,)
+
+
+def test_declared_dependencies_must_be_accepted_by_keyword(registry):
+    def make_service(*components: str) -> str:
+        pass
+
+    make_service.__dependencies__ = (Dependency("name", str, "name"),)
+    with pytest.raises(DependencyError):
+        registry.provides()(make_service)
+
+
+def test_declared_dependencies_must_cover_required_parameters(registry):
+    def make_service(name: str, greeting: str = "Hello") -> str:
+        pass
+
+    make_service.__dependencies__ = (Dependency("greeting", str, "greeting"),)
+    with pytest.raises(DependencyError):
+        registry.provides()(make_service)
+
+
+def test_declared_dependencies_must_be_dependencies(registry):
+    def make_service(**components: str) -> str:
+        pass
+
+    make_service.__dependencies__ = ("name",)
+    with pytest.raises(DependencyError):
+        registry.provides()(make_service)
+
+
+def test_declared_dependencies_are_not_inherited(registry):
+    class Base:
+        __dependencies__ = (Dependency("a", None, "a"),)
+
+        def __init__(self, **components):
+            pass
+
+    class Sub(Base):
+        def __init__(self, a, b):
+            pass
+
+    registry.provides()(Sub)
+    assert [d.parameter_name for d in registry.get("Sub").dependencies] == ["a", "b"]
+
+
+def test_providers_can_be_retrieved_by_name_and_profile(registry):
+    @registry.provides(name="greeting", profiles=["en"])
+    def make_english_greeting() -> str:
+        return "Hello"
+
+    @registry.provides(name="greeting", profiles=["!en"])
+    def make_default_greeting() -> str:
+        return "Hi"
+
+    assert registry.get("greeting").func is make_english_greeting
+    assert registry.get("greeting", {"en"}).func is make_english_greeting
+    assert registry.get("greeting", {"fr"}).func is make_default_greeting
+    with pytest.raises(KeyError):
+        registry.get("farewell")
+
+
+def test_memoized_provider_creates_its_component_once(registry, greeter):
+    @registry.provides(memoize=True)
+    def make_uppercase_greeter(
+        greeter: Annotated[Callable[[str], str], "greeter"],
+    ) -> Callable[[str], str]:
+        return lambda name: greeter(name).upper()
+
+    provider = registry.get("uppercase_greeter")
+    uppercase_greeter = provider.instance(greeter.instance())
+
+    assert provider.memoize
+    assert uppercase_greeter("Dominic") == "HELLO DOMINIC"
+    assert provider.instance(greeter.instance()) is uppercase_greeter
+    assert greeter.instance() is not greeter.instance()
+
+
+def test_providers_can_be_registered_together(registry):
+    @registry.provides()
+    def first():
+        pass
+
+    assert [c.name for c in registry.registered_providers({"test"})] == ["first"]
+
+    registry.register_all(
+        ComponentProvider(name, lambda: None, profiles, (), (), {})
+        for name, profiles in [("second", ("test",)), ("third", ("!test",))]
+    )
+
+    assert [c.name for c in registry.registered_providers()] == [
+        "first",
+        "second",
+        "third",
+    ]
+    assert [c.name for c in registry.registered_providers({"test"})] == [
+        "first",
+        "second",
+    ]
+
+
+def test_dependencies_can_be_copied_and_pickled():
+    dependency = Dependency("greeter", str, "greeter")
+
+    assert copy.copy(dependency) == dependency
+    assert copy.deepcopy(dependency) == dependency
+    assert pickle.loads(pickle.dumps(dependency)) == dependency
+
+
+def test_providers_can_be_copied(greeter):
+    copied = copy.copy(greeter)
+
+    assert copied == greeter
+    assert copied.included_profiles == greeter.included_profiles
+
+
+# Defined at module level, so that providers of it can be pickled.
+def make_pickled_greeting() -> str:
+    return "Hello"
+
+
+def test_providers_without_metadata_can_be_deep_copied_and_pickled(registry):
+    registry.provides()(make_pickled_greeting)
+    provider = registry.get("pickled_greeting")
+
+    for copied in copy.deepcopy(provider), pickle.loads(pickle.dumps(provider)):
+        assert copied == provider
+        assert copied.metadata == {}
+        assert copied.metadata is provider.metadata
+
+
+class Profile(str, Enum):
+    PROD = "prod"
+
+
+def test_profiles_can_be_str_enum_members(registry):
+    @registry.provides(profiles=[Profile.PROD])
+    def prod_only():
+        pass
+
+    @registry.provides(profiles=["!" + Profile.PROD.value])
+    def not_prod():
+        pass
+
+    assert [c.name for c in registry.registered_providers({Profile.PROD})] == [
+        "prod_only"
+    ]
+    assert [c.name for c in registry.registered_providers({"prod"})] == ["prod_only"]
+
+
+def test_enum_profiles_are_kept_apart_from_equal_strings():
+    def declare(profile):
+        registry = ComponentProviderRegistry()
+        registry.provides(name="thing", profiles=[profile])(lambda: None)
+        return registry.get("thing").profiles[0]
+
+    assert type(declare("prod")) is str
+    assert declare(Profile.PROD) is Profile.PROD
+    assert type(declare("prod")) is str
+
+
+class Name(str, Enum):
+    DATABASE = "database"
+
+
+def test_names_can_be_str_enum_members(registry):
+    @registry.provides(name=Name.DATABASE)
+    def make_db() -> str:
+        pass
+
+    assert registry.get("database").name == Name.DATABASE
+
+
+def test_analysed_providers_can_be_garbage_collected():
+    def make_provider():
+        def make_foo(bar: "str") -> str:
+            pass
+
+        return make_foo
+
+    @dataclass
+    class Foo:
+        bar: Annotated[str, "bar"]
+
+    registry = ComponentProviderRegistry()
+    registry.provides()(make_provider())
+    registry.provides()(Foo)
+    references = [weakref.ref(p.func) for p in registry.registered_providers()]
+
+    del registry, Foo
+    gc.collect()
+    assert all(reference() is None for reference in references)